@@ -149,16 +149,15 @@ class CalendarAPI:
             self.logger.error(f"请求失败: {e}", exc_info=True)
             return {'error': str(e)}
 
-        data = response.json()
-        # 获取对应值，如果不存在则返回空字典{}
-        result = data.get('result', {}).get('data', {})
-        # 检查result是否为空
-        if not result:
+        try:
+            # 解析并校验日历数据
+            calendar_day = JuheCalendarDay.from_json(response.content)
+        except PayloadError as e:
             error_message = "API响应中未找到有效的日历信息"
-            self.logger.error(error_message)
+            self.logger.error(f"{error_message}: {e}")
             return error_message, None
-        holiday = result.get('holiday')
-        date = result.get('date')
+        holiday = calendar_day.holiday
+        date = calendar_day.date
 
         # 解析并返回响应结果
         self.logger.info("获取到的日历信息: %s, 节日: %s", date, holiday)
@@ -174,12 +173,15 @@ def main():
     try:
         date_handler = DateHandler()
         calendarapi = CalendarAPI()
-        email_notifier = SendEmail()
+        # 创建运行历史实例，记录节日信息和发送结果
+        history = RunHistory()
+        email_notifier = SendEmail(history)
         # 获取节气和节日数据
         date, holiday = calendarapi.get_calendar_info()
         logger.info("获取到的数据: %s：%s", date, holiday)
 
         if holiday:
+            history.append('holiday', datetime.today() + timedelta(days=1), holiday=holiday)
             logger.info("正在发送节日提醒邮件...")
             # 拼接return值
             str = f'{date}：{holiday}'
@@ -1,6 +1,7 @@
 import requests
 import os
 import random
+from datetime import datetime
 import logging
 from pushplus.common import *
 
@@ -53,19 +54,17 @@ class LoveQuoteFetcher:
 
             # 检查请求是否成功
             if response.status_code == 200:
-                # 解析返回的JSON数据
-                quote_data = response.json()
-                self.logger.info(f"收到的响应: {quote_data}")
-
-                # 尝试从返回的数据中提取情话内容，提供一个默认值，若无数据则返回空字典{}
-                content = quote_data.get('result', {}).get('content')
-
-                # 如果找到了内容，返回去除空白字符的内容
-                if content is not None:
-                    return f"致亲爱的老婆：{content.strip()}"
-
-                # 如果没有找到content字段，打印提示信息
-                self.logger.warning("返回的数据中没有找到'content'字段")
+                # 解析并校验返回的JSON数据
+                try:
+                    quote = TianapiQuote.from_json(response.content)
+                except PayloadError as e:
+                    # 数据格式不符合预期时，打印提示信息
+                    self.logger.warning(f"情话数据格式错误: {e}")
+                    return None
+                self.logger.info(f"收到的响应: {quote}")
+
+                # 返回去除空白字符的内容
+                return f"致亲爱的老婆：{quote.content}"
 
         except Exception as e:
             # 如果发生异常，打印错误信息
@@ -85,23 +84,46 @@ def main():
 
     # 创建情话获取器实例
     quote_fetcher = LoveQuoteFetcher()
+    # 创建运行历史实例，用于情话去重和记录发送结果
+    history = RunHistory()
 
     # 过滤的值列表
     custom_values = ["嫁你", "嫁给你","像你",'娶我']
-
-    # 获取随机情话，并确保不包含自定义的值
-    quote = quote_fetcher.get_random_quote()
-    while any(value in quote for value in custom_values):
-        quote = quote_fetcher.get_random_quote()
+    # 最近90天内已经发送过的情话
+    sent_quotes = history.recent_quotes('self', days=90)
+
+    # 最多尝试的次数，避免重复的情话不断消耗接口调用次数
+    max_attempts = 5
+    quote = None
+    # 最近发送过但可用的情话，多次尝试仍无新情话时使用
+    fallback_quote = None
+
+    # 获取随机情话，并确保不包含自定义的值，且最近没有发送过
+    for _ in range(max_attempts):
+        candidate = quote_fetcher.get_random_quote()
+        # 请求失败或包含自定义的值时重新获取
+        if candidate is None or any(value in candidate for value in custom_values):
+            continue
+        if candidate not in sent_quotes:
+            quote = candidate
+            break
+        fallback_quote = candidate
+    else:
+        quote = fallback_quote
+        if quote:
+            logger.warning(f"尝试{max_attempts}次均为最近发送过的情话，使用重复的情话")
 
     logger.info(f"获取的情话: {quote}")
 
     if quote:
         # 创建邮件通知器实例
-        email_notifier = SendEmail()
+        email_notifier = SendEmail(history)
 
         # 发送邮件提醒
-        email_notifier.send_reminder_email('每日小情话', quote,is_group_send=False)
+        if email_notifier.send_reminder_email('每日小情话', quote,is_group_send=False):
+            history.append('quote', datetime.today(), recipient='self', content=quote)
+    else:
+        logger.warning("未获取到可用的情话，不会发送邮件提醒")
 
 
 if __name__ == "__main__":
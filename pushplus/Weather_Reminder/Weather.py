@@ -16,14 +16,19 @@ class WeatherInfoFetcher:
 
     Attributes:
         amap_key (str): 高德地图API密钥。
+        history (RunHistory): 用于记录天气数据的运行历史，可为None。
     """
     logger = logging.getLogger(__name__)  # 创建一个与当前模块同名的日志记录器
 
-    def __init__(self):
+    def __init__(self, history=None):
         """
         初始化WeatherInfoFetcher实例，从环境变量中读取高德地图API密钥。
+
+        Args:
+            history (RunHistory): 用于记录天气数据的运行历史，默认为None（不记录）。
         """
         self.amap_key = os.environ.get('AMAP_KEY') #环境变量
+        self.history = history
         self.logger.info("WeatherInfoFetcher 初始化完成")
 
 
@@ -66,34 +71,42 @@ class WeatherInfoFetcher:
         处理天气数据并打印相关信息。
 
         Args:
-            data (dict): API响应的JSON数据。
+            data (AmapWeather): 解析后的API响应。
             tomorrow_date (str): 明天的日期。
 
         Returns:
             tuple: 包含天气预报信息的字符串和天气状况字符串的元组。
         """
         # 检查API请求的状态码是否为成功状态
-        if data.get('status') != '1':
-            self.logger.error("请求 API 失败:",data.get('infocode'), data.get('info'))
+        if not data.ok:
+            self.logger.error(f"请求 API 失败: {data.infocode} {data.info}")
             return None, None
         # 从API响应数据中提取预报数据
-        forecasts = data.get('forecasts')
-        if not forecasts:
+        if not data.forecasts:
             self.logger.error("没有找到天气信息。")
             return None, None
-        # 从预报数据中提取具体的天气预报列表
-        forecast_list = forecasts[0].get('casts', [])
+        # 从预报数据中提取城市的天气预报
+        city_forecast = data.forecasts[0]
+        adcode = city_forecast.adcode
+
+        # 记录本次获取到的所有预报，供之后的温度对比使用
+        if self.history is not None:
+            for forecast in city_forecast.casts:
+                self.history.append('weather', forecast.date, adcode=adcode, dayweather=forecast.dayweather,
+                                    daytemp=forecast.daytemp, nighttemp=forecast.nighttemp)
 
         # 调用 get_weather_forecast 函数处理预报数据并获取天气预报信息字符串
-        weather_forecast, weather_condition = self.get_weather_forecast(forecast_list, tomorrow_date)
+        weather_forecast, weather_condition = self.get_weather_forecast(city_forecast, tomorrow_date)
+        # 追加与今天相比的温度变化
+        weather_forecast += self.get_temperature_change(adcode, tomorrow_date)
         return weather_forecast, weather_condition
 
-    def get_weather_forecast(self, forecast_list, tomorrow_date):
+    def get_weather_forecast(self, city_forecast, tomorrow_date):
         """
         返回明天的天气预报信息作为字符串，并附带天气状况。
 
         Args:
-            forecast_list (list): 预报数据列表。
+            city_forecast (AmapForecast): 城市的预报数据。
             tomorrow_date (str): 明天的日期。
 
         Returns:
@@ -105,41 +118,52 @@ class WeatherInfoFetcher:
         # 初始化天气状况为默认值
         weather_condition = '未知天气状况'
 
-        # 标记是否找到了明天的天气预报信息，默认为False
-        found = False
-
-        # 遍历预报数据列表
-        for forecast in forecast_list:
-            # 获取当前预报记录的日期
-            forecast_date = forecast['date']
-
-            # 如果找到了匹配的日期（即明天的日期）
-            if forecast_date == tomorrow_date:
-                # 将日期信息添加到结果字符串中
-                result += f"日期: {forecast_date}({'周日' if forecast['week'] == 7 else f'周{forecast["week"]}'})\n"
-                # 将白天的天气状况添加到结果字符串中
-                result += f"白天天气状况: {forecast['dayweather']}\n"
-                # 将白天和夜间温度范围添加到结果字符串中
-                result += f"温度: {forecast['nighttemp']}°C-{forecast['daytemp']}°C\n"
-                # 更新天气状况
-                weather_condition = forecast['dayweather']
-                # 设置标记为True表示已经找到了对应的天气预报
-                found = True
-
-                # 结束循环，不再查找其他记录
-                break
-        # 如果没有找到对应的天气预报，则在结果字符串中加入提示信息
-        if not found:
+        # 查找明天的天气预报
+        forecast = city_forecast.cast_for(tomorrow_date)
+
+        if forecast is not None:
+            # 将日期信息添加到结果字符串中
+            result += f"日期: {forecast.date}({'周日' if forecast.week == 7 else f'周{forecast.week}'})\n"
+            # 将白天的天气状况添加到结果字符串中
+            result += f"白天天气状况: {forecast.dayweather}\n"
+            # 将白天和夜间温度范围添加到结果字符串中
+            result += f"温度: {forecast.nighttemp}°C-{forecast.daytemp}°C\n"
+            # 更新天气状况
+            weather_condition = forecast.dayweather
+        else:
+            # 如果没有找到对应的天气预报，则在结果字符串中加入提示信息
             result += "未找到明天的天气信息。"
         # 返回预报信息字符串和天气状况字符串的元组
         return result, weather_condition
 
+    def get_temperature_change(self, adcode, tomorrow_date):
+        """
+        根据运行历史返回明天与今天的白天温度对比。
+
+        Args:
+            adcode (str): 城市编码。
+            tomorrow_date (str): 明天的日期。
+
+        Returns:
+            str: 温度对比信息字符串，没有历史数据时返回空字符串。
+        """
+        if self.history is None:
+            return ""
+        change = self.history.temperature_change(adcode, tomorrow_date)
+        if change is None:
+            return ""
+        if change > 0:
+            return f"明天比今天升温{change}°C\n"
+        if change < 0:
+            return f"明天比今天降温{-change}°C\n"
+        return "明天与今天温度持平\n"
+
     def get_weather_live(self, realtime_weather):
         """
         返回实时天气信息作为字符串。
 
         Args:
-            realtime_weather (dict): 实时天气信息的字典。
+            realtime_weather (AmapLive): 实时天气信息。
 
         Returns:
             str: 包含实时天气信息的字符串。
@@ -149,13 +173,13 @@ class WeatherInfoFetcher:
         # 如果实时天气信息存在且非空
         if realtime_weather:
             # 添加城市名和实时天气信息标题
-            result += f"{realtime_weather['city']}-实时天气信息:\n"
+            result += f"{realtime_weather.city}-实时天气信息:\n"
 
             # 添加天气状况信息
-            result += f"天气状况: {realtime_weather['weather']}\n"
+            result += f"天气状况: {realtime_weather.weather}\n"
 
             # 添加当前温度信息
-            result += f"温度: {realtime_weather['temperature']}°C\n"
+            result += f"温度: {realtime_weather.temperature}°C\n"
         # 返回构造好的天气信息字符串
         return result
 
@@ -178,8 +202,8 @@ class WeatherInfoFetcher:
             response = requests.get(complete_url)
             # 检查 HTTP 响应状态码，如果状态码不是200，则抛出异常
             response.raise_for_status()
-            # 将 JSON 响应转换为 Python 字典
-            data = response.json()
+            # 将 JSON 响应解析为天气数据模型
+            data = AmapWeather.from_json(response.content)
             # 获取明天的日期
             tomorrow_date = self.get_tomorrow_date()
             # 处理数据，获取天气预报信息
@@ -190,6 +214,9 @@ class WeatherInfoFetcher:
         except requests.exceptions.RequestException as e:
             self.logger.error(f"请求过程中发生错误: {e}")
             return None, None
+        except PayloadError as e:
+            self.logger.error(f"天气数据格式错误: {e}")
+            return None, None
 
     def fetch_live_weather_info(self):
         """
@@ -202,17 +229,19 @@ class WeatherInfoFetcher:
         try:
             response = requests.get(complete_url)
             response.raise_for_status()
-            data = response.json()
-            if data.get('status') != '1':
-                self.logger.error("请求 API 失败:", data.get('infocode'), data.get('info'))
+            data = AmapWeather.from_json(response.content)
+            if not data.ok:
+                self.logger.error(f"请求 API 失败: {data.infocode} {data.info}")
                 return None
             # 获取实时天气数据
-            lives = data.get('lives')
-            if not lives:
+            if not data.lives:
                 self.logger.error("没有找到实时天气信息。")
                 return None
             # 提取实时天气信息
-            live_weather = lives[0]
+            live_weather = data.lives[0]
+            if self.history is not None:
+                self.history.append('live', datetime.now(), adcode=live_weather.adcode,
+                                    weather=live_weather.weather, temperature=live_weather.temperature)
             # 获取实时天气信息字符串
             weather_live = self.get_weather_live(live_weather)
 
@@ -220,6 +249,9 @@ class WeatherInfoFetcher:
         except requests.exceptions.RequestException as e:
             self.logger.error(f"请求过程中发生错误: {e}")
             return None
+        except PayloadError as e:
+            self.logger.error(f"天气数据格式错误: {e}")
+            return None
 
     def get_weather_advice(self, weather_condition):
         """
@@ -264,10 +296,12 @@ def main():
     """
     logger = logging.getLogger(__name__)  # 创建一个与当前模块同名的日志记录器
 
+    # 创建运行历史实例，记录获取的天气数据和发送结果
+    history = RunHistory()
     # 创建天气信息获取器实例
-    weather_fetcher = WeatherInfoFetcher()
+    weather_fetcher = WeatherInfoFetcher(history)
     # 创建邮件发送器实例
-    email_sender = SendEmail()
+    email_sender = SendEmail(history)
 
     # 获取实时天气信息
     realtime_weather = weather_fetcher.fetch_live_weather_info()
@@ -0,0 +1,294 @@
+import re
+import json
+from dataclasses import dataclass
+
+try:
+    import orjson  # 可选依赖，安装后使用更快的JSON解析
+except ImportError:
+    orjson = None
+
+
+class PayloadError(ValueError):
+    """
+    上游接口返回的数据不符合预期结构时抛出的异常。
+    """
+
+
+def loads_json(content):
+    """
+    解析JSON数据，安装了orjson时优先使用orjson。
+
+    Args:
+        content (bytes|str): 原始JSON内容。
+
+    Returns:
+        解析后的Python对象。
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+    except ValueError as e:
+        raise PayloadError(f"无法解析JSON数据: {e}") from e
+
+
+_INTEGER = re.compile(r'-?\d+')
+
+
+def _field(data, key, kind=str, required=True):
+    """
+    从字典中读取字段并校验类型。
+
+    str、list、dict 只做类型校验，不做转换；int 接受整数或整数字符串（高德返回的数字均为字符串）。
+
+    Args:
+        data (dict): 数据字典。
+        key (str): 字段名。
+        kind (type): 期望的类型，可选 str、int、list、dict，默认为str。
+        required (bool): 是否必填，非必填字段缺失或为空时返回None。
+
+    Returns:
+        校验后的字段值。
+    """
+    if not isinstance(data, dict):
+        raise PayloadError(f"期望对象类型，实际为: {type(data).__name__}")
+    value = data.get(key)
+    if value is None or value == '' or value == []:
+        if required:
+            raise PayloadError(f"缺少字段: {key}")
+        return None
+    if kind is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and _INTEGER.fullmatch(value.strip()):
+            return int(value)
+        raise PayloadError(f"字段 {key} 的值无效: {value!r}")
+    if not isinstance(value, kind):
+        raise PayloadError(f"字段 {key} 的类型应为 {kind.__name__}，实际为: {type(value).__name__}")
+    return value
+
+
+class _Payload:
+    """
+    上游接口数据模型的基类，提供从原始JSON构造模型的入口。
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从解析后的JSON数据构造模型，数据不符合预期结构时抛出PayloadError。
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def from_json(cls, content):
+        """
+        解析原始JSON内容（bytes或str）并构造模型。
+        """
+        return cls.from_dict(loads_json(content))
+
+
+@dataclass(frozen=True)
+class AmapLive(_Payload):
+    """
+    高德地图实况天气。
+
+    Attributes:
+        city (str): 城市名称。
+        adcode (str): 城市编码。
+        weather (str): 天气状况。
+        temperature (int): 实时温度（°C）。
+        reporttime (str): 数据发布时间。
+    """
+    __slots__ = ('city', 'adcode', 'weather', 'temperature', 'reporttime')
+
+    city: str
+    adcode: str
+    weather: str
+    temperature: int
+    reporttime: str
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 lives 中的一项构造实况天气。
+        """
+        return cls(
+            city=_field(data, 'city'),
+            adcode=_field(data, 'adcode'),
+            weather=_field(data, 'weather'),
+            temperature=_field(data, 'temperature', int),
+            reporttime=_field(data, 'reporttime', required=False),
+        )
+
+
+@dataclass(frozen=True)
+class AmapCast(_Payload):
+    """
+    高德地图单日预报天气。
+
+    Attributes:
+        date (str): 日期，格式为 'YYYY-MM-DD'。
+        week (int): 星期几，1~7，7表示周日。
+        dayweather (str): 白天天气状况。
+        nightweather (str): 夜间天气状况。
+        daytemp (int): 白天温度（°C）。
+        nighttemp (int): 夜间温度（°C）。
+    """
+    __slots__ = ('date', 'week', 'dayweather', 'nightweather', 'daytemp', 'nighttemp')
+
+    date: str
+    week: int
+    dayweather: str
+    nightweather: str
+    daytemp: int
+    nighttemp: int
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 casts 中的一项构造单日预报，week 和温度转换为整数。
+        """
+        return cls(
+            date=_field(data, 'date'),
+            week=_field(data, 'week', int),
+            dayweather=_field(data, 'dayweather'),
+            nightweather=_field(data, 'nightweather', required=False),
+            daytemp=_field(data, 'daytemp', int),
+            nighttemp=_field(data, 'nighttemp', int),
+        )
+
+
+@dataclass(frozen=True)
+class AmapForecast(_Payload):
+    """
+    高德地图某城市的预报天气。
+
+    Attributes:
+        city (str): 城市名称。
+        adcode (str): 城市编码。
+        casts (tuple): 各天的预报，AmapCast 元组。
+    """
+    __slots__ = ('city', 'adcode', 'casts')
+
+    city: str
+    adcode: str
+    casts: tuple
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 forecasts 中的一项构造城市预报。
+        """
+        return cls(
+            city=_field(data, 'city'),
+            adcode=_field(data, 'adcode'),
+            casts=tuple(AmapCast.from_dict(cast) for cast in _field(data, 'casts', list, required=False) or ()),
+        )
+
+    def cast_for(self, date):
+        """
+        返回指定日期的预报，没有时返回None。
+
+        Args:
+            date (str): 日期，格式为 'YYYY-MM-DD'。
+        """
+        for cast in self.casts:
+            if cast.date == date:
+                return cast
+        return None
+
+
+@dataclass(frozen=True)
+class AmapWeather(_Payload):
+    """
+    高德地图天气接口的响应。
+
+    Attributes:
+        status (str): 返回状态，'1' 表示成功。
+        infocode (str): 返回状态码。
+        info (str): 返回状态说明。
+        lives (tuple): 实况天气，AmapLive 元组（extensions=base 时）。
+        forecasts (tuple): 预报天气，AmapForecast 元组（extensions=all 时）。
+    """
+    __slots__ = ('status', 'infocode', 'info', 'lives', 'forecasts')
+
+    status: str
+    infocode: str
+    info: str
+    lives: tuple
+    forecasts: tuple
+
+    @property
+    def ok(self):
+        return self.status == '1'
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从完整响应构造，status 不为 '1' 时只保留状态信息。
+        """
+        status = _field(data, 'status')
+        # 请求失败时高德不会返回天气数据，只保留状态信息
+        ok = status == '1'
+        lives = _field(data, 'lives', list, required=False) if ok else None
+        forecasts = _field(data, 'forecasts', list, required=False) if ok else None
+        return cls(
+            status=status,
+            infocode=_field(data, 'infocode', required=False),
+            info=_field(data, 'info', required=False),
+            lives=tuple(AmapLive.from_dict(live) for live in lives or ()),
+            forecasts=tuple(AmapForecast.from_dict(item) for item in forecasts or ()),
+        )
+
+
+@dataclass(frozen=True)
+class JuheCalendarDay(_Payload):
+    """
+    聚合数据日历接口返回的某一天的日历信息。
+
+    Attributes:
+        date (str): 日期，格式为 'YYYY-M-D'。
+        holiday (str): 节日名称，没有节日时为None。
+    """
+    __slots__ = ('date', 'holiday')
+
+    date: str
+    holiday: str
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从完整响应构造，result 或 result.data 缺失时抛出PayloadError。
+        """
+        result = _field(data, 'result', dict)
+        day = _field(result, 'data', dict)
+        return cls(
+            date=_field(day, 'date'),
+            holiday=_field(day, 'holiday', required=False),
+        )
+
+
+@dataclass(frozen=True)
+class TianapiQuote(_Payload):
+    """
+    天API情话/彩虹屁接口返回的一条内容。
+
+    Attributes:
+        content (str): 去除首尾空白后的内容。
+    """
+    __slots__ = ('content',)
+
+    content: str
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从完整响应构造，content 去除空白后为空时抛出PayloadError。
+        """
+        result = _field(data, 'result', dict)
+        content = _field(result, 'content').strip()
+        if not content:
+            raise PayloadError("字段 content 为空")
+        return cls(content=content)
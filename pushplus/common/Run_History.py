@@ -0,0 +1,382 @@
+import os
+import gzip
+import json
+import bisect
+import logging
+from datetime import date, timedelta
+
+
+class RunHistory:
+    """
+    追加写入的运行历史存储，记录每次运行获取到的数据和发送结果。
+
+    每张表由一个追加写入的活动日志（active.jsonl）和按月分区的列式段文件
+    （YYYY-MM.seg.gz）组成。活动日志超过阈值时会被压实（compact）进对应月份的
+    段文件：段内按日期排序，字符串列做字典编码后以gzip压缩的JSON保存，
+    范围查询只需打开时间范围内的月份段并用二分查找定位。
+
+    Attributes:
+        root (str): 历史数据的根目录。
+        compact_threshold (int): 活动日志达到多少行时自动压实。
+    """
+    logger = logging.getLogger(__name__)  # 创建一个与当前模块同名的日志记录器
+
+    # 每张表的列定义：(列名, 类型)，'day' 列固定在最前面，保存为日期序数
+    SCHEMAS = {
+        'weather': (('adcode', str), ('dayweather', str), ('daytemp', int), ('nighttemp', int)),
+        'live': (('adcode', str), ('weather', str), ('temperature', int)),
+        'holiday': (('holiday', str),),
+        'quote': (('recipient', str), ('content', str)),
+        'delivery': (('recipient', str), ('title', str), ('ok', int), ('status', int)),
+    }
+
+    ACTIVE_LOG = 'active.jsonl'
+    SEGMENT_SUFFIX = '.seg.gz'
+    CORRUPT_SUFFIX = '.corrupt'
+
+    def __init__(self, root=None, compact_threshold=500):
+        """
+        初始化RunHistory实例，未指定根目录时从环境变量 RUN_HISTORY_DIR 读取，默认为 'history'。
+
+        Args:
+            root (str): 历史数据的根目录。
+            compact_threshold (int): 活动日志达到多少行时自动压实。
+        """
+        self.root = root or os.environ.get('RUN_HISTORY_DIR', 'history')
+        self.compact_threshold = compact_threshold
+        self._active_counts = {}
+        self.logger.info(f"RunHistory 初始化完成，目录: {self.root}")
+
+    @staticmethod
+    def _to_day(value):
+        """
+        将 date/datetime 或 'YYYY-MM-DD' 字符串统一转换为 date 对象。
+        """
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+        if hasattr(value, 'date'):
+            return value.date()
+        return value
+
+    def _schema(self, table):
+        schema = self.SCHEMAS.get(table)
+        if schema is None:
+            raise ValueError(f"未知的历史表: {table}")
+        return schema
+
+    def _table_dir(self, table):
+        return os.path.join(self.root, table)
+
+    def _active_path(self, table):
+        return os.path.join(self._table_dir(table), self.ACTIVE_LOG)
+
+    def _segment_path(self, table, month):
+        return os.path.join(self._table_dir(table), f"{month}{self.SEGMENT_SUFFIX}")
+
+    def _segment_months(self, table):
+        """
+        返回该表所有段文件对应的月份（'YYYY-MM'），已排序。
+        """
+        table_dir = self._table_dir(table)
+        if not os.path.isdir(table_dir):
+            return []
+        return sorted(name[:-len(self.SEGMENT_SUFFIX)] for name in os.listdir(table_dir)
+                      if name.endswith(self.SEGMENT_SUFFIX))
+
+    def append(self, table, day, **fields):
+        """
+        向指定表追加一行记录。取值转换、写入或压实失败只记录日志，不影响提醒的发送；
+        未知的表名属于调用错误，仍会抛出ValueError。
+
+        Args:
+            table (str): 表名，见 SCHEMAS。
+            day (date|datetime|str): 记录所属的日期。
+            **fields: 该表的各列取值，缺失的列记为空值。
+        """
+        schema = self._schema(table)
+        try:
+            row = [self._to_day(day).toordinal()]
+            for name, kind in schema:
+                value = fields.get(name)
+                row.append(kind(value) if value not in (None, '') else None)
+
+            os.makedirs(self._table_dir(table), exist_ok=True)
+            with open(self._active_path(table), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+            count = self._active_counts.get(table)
+            if count is None:
+                count = len(self._read_active(table))
+            else:
+                count += 1
+            self._active_counts[table] = count
+            if count >= self.compact_threshold:
+                self.compact(table)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.error(f"写入历史记录失败: {e}")
+
+    def _read_active(self, table):
+        """
+        读取活动日志中的所有行，忽略写入中断造成的残缺行。
+        """
+        path = self._active_path(table)
+        if not os.path.exists(path):
+            return []
+        rows = []
+        width = len(self._schema(table)) + 1
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                if not isinstance(row, list) or len(row) != width or not isinstance(row[0], int):
+                    self.logger.warning(f"跳过损坏的历史记录行: {line.strip()}")
+                    continue
+                rows.append(row)
+        return rows
+
+    def _load_segment(self, table, month):
+        """
+        读取并校验段文件。段文件损坏时将其重命名为 *.corrupt 移到一边并记录日志，
+        之后的读取和压实不会再反复撞上同一个损坏的文件。
+
+        Returns:
+            dict: 段文件内容（columns 和 dicts），损坏时返回None。
+        """
+        path = self._segment_path(table, month)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                segment = json.load(f)
+            columns = segment['columns']
+            dicts = segment['dicts']
+            length = len(columns['day'])
+            for name, kind in self._schema(table):
+                if len(columns[name]) != length or (kind is str) != (name in dicts):
+                    raise ValueError(f"列 {name} 与段结构不一致")
+            return segment
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.error(f"历史段文件 {path} 已损坏，移至 {path}{self.CORRUPT_SUFFIX}: {e}")
+            try:
+                os.replace(path, path + self.CORRUPT_SUFFIX)
+            except OSError as move_error:
+                self.logger.error(f"移动损坏的历史段文件失败: {move_error}")
+            return None
+
+    def _read_segment(self, table, month, low=None, high=None, filters=None):
+        """
+        读取一个段文件，返回按行排列的记录列表（day 列在前）。
+
+        先用二分查找在 day 列上截取日期范围，再在字典编码后的列上比较过滤条件，
+        只为命中的行解码出完整记录；过滤值不在段字典中时直接跳过整个段。
+
+        Args:
+            table (str): 表名。
+            month (str): 段对应的月份，格式为 'YYYY-MM'。
+            low (int): 开始日期序数（含），默认为None（不限）。
+            high (int): 结束日期序数（含），默认为None（不限）。
+            filters (dict): 列名与期望值（已按列类型转换），默认为None（不过滤）。
+
+        Returns:
+            list: 命中的记录，段文件损坏时返回空列表。
+        """
+        segment = self._load_segment(table, month)
+        if segment is None:
+            return []
+        columns = segment['columns']
+        dicts = segment['dicts']
+
+        days = columns['day']
+        start = bisect.bisect_left(days, low) if low is not None else 0
+        end = bisect.bisect_right(days, high) if high is not None else len(days)
+        positions = range(start, end)
+
+        for name, value in (filters or {}).items():
+            column = columns[name]
+            if name in dicts:
+                # 字典已排序，用二分查找得到过滤值的编码
+                values = dicts[name]
+                code = bisect.bisect_left(values, value) if value is not None else -1
+                if value is not None and (code == len(values) or values[code] != value):
+                    return []
+                value = code
+            positions = [i for i in positions if column[i] == value]
+            if not positions:
+                return []
+
+        rows = []
+        names = ['day'] + [name for name, _ in self._schema(table)]
+        for i in positions:
+            row = []
+            for name in names:
+                value = columns[name][i]
+                if name in dicts:
+                    value = dicts[name][value] if value >= 0 else None
+                row.append(value)
+            rows.append(row)
+        return rows
+
+    def _write_segment(self, table, month, rows):
+        """
+        将记录按日期排序后以列式格式写入段文件，字符串列做字典编码。
+        先写临时文件再替换，保证压实过程中断时旧段文件仍然完整。
+        """
+        rows.sort(key=lambda row: row[0])
+        columns = {}
+        dicts = {}
+        for index, (name, kind) in enumerate((('day', int),) + self._schema(table)):
+            column = [row[index] for row in rows]
+            if kind is str:
+                values = sorted({value for value in column if value is not None})
+                positions = {value: i for i, value in enumerate(values)}
+                column = [positions[value] if value is not None else -1 for value in column]
+                dicts[name] = values
+            columns[name] = column
+
+        path = self._segment_path(table, month)
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+            json.dump({'columns': columns, 'dicts': dicts}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+
+    def compact(self, table=None):
+        """
+        将活动日志合并进按月分区的段文件，然后清空活动日志。
+
+        Args:
+            table (str): 要压实的表名，默认为None（压实所有表）。
+        """
+        tables = [table] if table else list(self.SCHEMAS)
+        for name in tables:
+            rows = self._read_active(name)
+            if not rows:
+                continue
+            by_month = {}
+            for row in rows:
+                month = date.fromordinal(row[0]).strftime('%Y-%m')
+                by_month.setdefault(month, []).append(row)
+
+            existing = set(self._segment_months(name))
+            for month, month_rows in by_month.items():
+                if month in existing:
+                    month_rows = self._read_segment(name, month) + month_rows
+                self._write_segment(name, month, month_rows)
+
+            os.remove(self._active_path(name))
+            self._active_counts[name] = 0
+            self.logger.info(f"历史表 {name} 压实完成，合并 {len(rows)} 条记录")
+
+    def _coerce_filters(self, table, filters):
+        """
+        校验过滤条件的列名，并按列类型转换过滤值，使段文件和活动日志的比较结果一致。
+
+        Returns:
+            dict: 转换后的过滤条件。
+        """
+        kinds = dict(self._schema(table))
+        coerced = {}
+        for name, value in filters.items():
+            if name not in kinds:
+                raise ValueError(f"历史表 {table} 没有可过滤的列: {name}")
+            if value is None:
+                coerced[name] = None
+                continue
+            try:
+                coerced[name] = kinds[name](value)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"列 {name} 的过滤值无效: {value!r}") from e
+        return coerced
+
+    def scan(self, table, start=None, end=None, **filters):
+        """
+        按日期范围（闭区间）和列值过滤扫描历史记录。
+
+        Args:
+            table (str): 表名。
+            start (date|datetime|str): 开始日期，默认为None（不限）。
+            end (date|datetime|str): 结束日期，默认为None（不限）。
+            **filters: 列名与期望值，仅返回完全匹配的记录。
+
+        Returns:
+            list: 按日期排序的记录字典列表，'day' 为 date 对象。读取历史失败时只记录日志，
+            跳过无法读取的部分；列名不存在或过滤值类型不符时抛出ValueError。
+        """
+        schema = self._schema(table)
+        names = ['day'] + [name for name, _ in schema]
+        low = self._to_day(start).toordinal() if start else 0
+        high = self._to_day(end).toordinal() if end else date.max.toordinal()
+        low_month = date.fromordinal(low).strftime('%Y-%m') if start else ''
+        high_month = date.fromordinal(high).strftime('%Y-%m')
+        filters = self._coerce_filters(table, filters)
+        checks = [(names.index(name), value) for name, value in filters.items()]
+
+        rows = []
+        try:
+            for month in self._segment_months(table):
+                if not low_month <= month <= high_month:
+                    continue
+                rows.extend(self._read_segment(table, month, low, high, filters))
+            # 活动日志未做列式编码，逐行过滤；放在段之后，保证同一天内后写入的记录排在后面
+            rows.extend(row for row in self._read_active(table)
+                        if low <= row[0] <= high and all(row[index] == value for index, value in checks))
+        except OSError as e:
+            self.logger.error(f"读取历史记录失败: {e}")
+
+        result = []
+        for row in rows:
+            record = dict(zip(names, row))
+            record['day'] = date.fromordinal(record['day'])
+            result.append(record)
+        result.sort(key=lambda record: record['day'])
+        return result
+
+    def temperature_change(self, adcode, day):
+        """
+        比较某地某天与前一天的预报白天温度。
+
+        Args:
+            adcode (str): 城市编码。
+            day (date|datetime|str): 要比较的日期。
+
+        Returns:
+            int: 温度变化值（正数为升温，负数为降温），缺少任意一天的数据时返回None。
+        """
+        day = self._to_day(day)
+        records = self.scan('weather', day - timedelta(days=1), day, adcode=adcode)
+        # 同一天可能被多次运行记录，取最后一次的预报
+        temps = {record['day']: record['daytemp'] for record in records if record['daytemp'] is not None}
+        if day not in temps or day - timedelta(days=1) not in temps:
+            return None
+        return temps[day] - temps[day - timedelta(days=1)]
+
+    def recent_quotes(self, recipient, days=90, today=None):
+        """
+        返回最近若干天内发送给某收件人的情话集合，用于去重。
+
+        Args:
+            recipient (str): 收件人标识。
+            days (int): 回溯天数，默认为90天。
+            today (date): 基准日期，默认为None（使用今天）。
+
+        Returns:
+            set: 已发送过的情话内容。
+        """
+        today = self._to_day(today) if today else date.today()
+        records = self.scan('quote', today - timedelta(days=days), today, recipient=recipient)
+        return {record['content'] for record in records}
+
+    def delivery_success_rate(self, start=None, end=None):
+        """
+        按天统计邮件发送成功率。
+
+        Args:
+            start (date|datetime|str): 开始日期，默认为None（不限）。
+            end (date|datetime|str): 结束日期，默认为None（不限）。
+
+        Returns:
+            dict: 日期到成功率（0~1之间的浮点数）的映射。
+        """
+        totals = {}
+        for record in self.scan('delivery', start, end):
+            sent, ok = totals.get(record['day'], (0, 0))
+            totals[record['day']] = (sent + 1, ok + (record['ok'] or 0))
+        return {day: ok / sent for day, (sent, ok) in totals.items()}
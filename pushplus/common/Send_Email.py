@@ -1,6 +1,7 @@
 import os
 import logging
 import requests
+from datetime import datetime
 
 
 class SendEmail:
@@ -9,17 +10,22 @@ class SendEmail:
 
     Attributes:
         pushplus_token (str): PushPlus的服务Token。
+        history (RunHistory): 用于记录发送结果的运行历史，可为None。
     """
     logger = logging.getLogger(__name__)  # 创建一个与当前模块同名的日志记录器
 
-    def __init__(self):
+    def __init__(self, history=None):
         """
         初始化SendEmail实例，从环境变量中读取PushPlus的服务Token。
+
+        Args:
+            history (RunHistory): 用于记录发送结果的运行历史，默认为None（不记录）。
         """
         self.pushplus_token = os.environ.get('PUSHPLUS_TOKEN')
         if not self.pushplus_token:
             self.logger.error("未设置 PUSHPLUS_TOKEN 环境变量")
             raise ValueError("PUSHPLUS_TOKEN 环境变量未设置")
+        self.history = history
 
         self.logger.info("SendEmail 初始化完成")
 
@@ -31,6 +37,9 @@ class SendEmail:
             title (str): 邮件标题。
             content (str): 邮件内容。
             is_group_send (bool): 是否群组发送，默认为False（即个人接收）。
+
+        Returns:
+            bool: 发送成功返回True，否则返回False。
         """
         url = "http://www.pushplus.plus/send"
         data = {
@@ -52,7 +61,14 @@ class SendEmail:
         headers = {'Content-Type': 'application/json'}
         response = requests.post(url, json=data, headers=headers)
 
-        if response.status_code == 200:
+        success = response.status_code == 200
+        if success:
             self.logger.info("邮件提醒发送成功")
         else:
-            self.logger.error(f"邮件提醒发送失败，状态码：{response.status_code}")
\ No newline at end of file
+            self.logger.error(f"邮件提醒发送失败，状态码：{response.status_code}")
+
+        # 记录发送结果，收件人只记录 'group'/'self' 标签，避免群组topic明文写入历史
+        if self.history is not None:
+            self.history.append('delivery', datetime.today(), recipient='group' if is_group_send else 'self',
+                                title=title, ok=success, status=response.status_code)
+        return success
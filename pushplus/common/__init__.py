@@ -1 +1,4 @@
 from .Send_Email import SendEmail  # 导入类
+from .Run_History import RunHistory  # 导入类
+from .Payload_Models import (PayloadError, AmapLive, AmapCast, AmapForecast, AmapWeather, JuheCalendarDay,
+                             TianapiQuote)  # 导入数据模型
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from pushplus.common import AmapWeather, JuheCalendarDay, PayloadError, TianapiQuote
+
+
+def _forecast_payload(**cast):
+    base = {'date': '2026-10-25', 'week': '7', 'dayweather': '小雨', 'nightweather': '阴',
+            'daytemp': '22', 'nighttemp': '18'}
+    base.update(cast)
+    return {'status': '1', 'info': 'OK', 'infocode': '10000',
+            'forecasts': [{'city': '深圳市', 'adcode': '440300', 'casts': [base]}]}
+
+
+def test_amap_forecast_converts_numeric_strings():
+    weather = AmapWeather.from_json(json.dumps(_forecast_payload()).encode())
+
+    assert weather.ok
+    cast = weather.forecasts[0].cast_for('2026-10-25')
+    assert (cast.week, cast.daytemp, cast.nighttemp) == (7, 22, 18)
+    assert weather.forecasts[0].cast_for('2026-10-26') is None
+
+
+def test_amap_live_converts_temperature():
+    payload = {'status': '1', 'lives': [{'city': '深圳市', 'adcode': '440300', 'weather': '晴',
+                                         'temperature': '25', 'reporttime': '2026-10-19 21:00:00'}]}
+
+    live = AmapWeather.from_dict(payload).lives[0]
+    assert live.temperature == 25
+    assert not hasattr(live, '__dict__')
+
+
+def test_amap_failed_status_keeps_only_status():
+    weather = AmapWeather.from_json(b'{"status":"0","info":"INVALID_USER_KEY","infocode":"10001"}')
+
+    assert not weather.ok
+    assert weather.info == 'INVALID_USER_KEY'
+    assert weather.lives == () and weather.forecasts == ()
+
+
+@pytest.mark.parametrize('payload', [
+    {'status': '1', 'lives': 5},
+    {'status': '1', 'forecasts': {'city': '深圳市'}},
+    {'status': '1', 'forecasts': [{'city': '深圳市', 'adcode': '440300', 'casts': 'abc'}]},
+    _forecast_payload(week='周日'),
+    _forecast_payload(daytemp=['22']),
+    _forecast_payload(dayweather=None),
+    {'info': 'OK'},
+])
+def test_amap_invalid_payload_raises(payload):
+    with pytest.raises(PayloadError):
+        AmapWeather.from_dict(payload)
+
+
+def test_invalid_json_raises_payload_error():
+    with pytest.raises(PayloadError):
+        AmapWeather.from_json(b'<html>')
+
+
+def test_juhe_calendar_day():
+    day = JuheCalendarDay.from_json('{"result":{"data":{"date":"2026-10-1","holiday":"国庆节"}}}'.encode())
+
+    assert (day.date, day.holiday) == ('2026-10-1', '国庆节')
+    assert JuheCalendarDay.from_dict({'result': {'data': {'date': '2026-10-2'}}}).holiday is None
+
+
+@pytest.mark.parametrize('content', [
+    b'{"result":null,"error_code":10001}',
+    b'{"result":{"data":[]}}',
+    '{"result":{"data":{"holiday":"国庆节"}}}'.encode(),
+])
+def test_juhe_invalid_payload_raises(content):
+    with pytest.raises(PayloadError):
+        JuheCalendarDay.from_json(content)
+
+
+def test_tianapi_quote_strips_content():
+    assert TianapiQuote.from_json('{"result":{"content":" 你好 "}}'.encode()).content == '你好'
+
+
+@pytest.mark.parametrize('content', [
+    b'{"result":{"content":"   "}}',
+    b'{"result":{"content":["a"]}}',
+    b'{"result":{}}',
+    b'{"code":250}',
+])
+def test_tianapi_invalid_quote_raises(content):
+    with pytest.raises(PayloadError):
+        TianapiQuote.from_json(content)
@@ -0,0 +1,150 @@
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from pushplus.common import RunHistory
+
+
+def _segment_files(history, table):
+    return sorted(name for name in os.listdir(os.path.join(history.root, table)) if name.endswith('.seg.gz'))
+
+
+def test_compact_splits_rows_by_month(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    for offset in range(10):
+        history.append('weather', date(2026, 9, 26) + timedelta(days=offset), adcode='440300',
+                       dayweather='晴', daytemp=20 + offset, nighttemp=15)
+    history.compact()
+
+    assert _segment_files(history, 'weather') == ['2026-09.seg.gz', '2026-10.seg.gz']
+    assert not os.path.exists(os.path.join(history.root, 'weather', 'active.jsonl'))
+    records = history.scan('weather')
+    assert [record['daytemp'] for record in records] == list(range(20, 30))
+    assert records[0]['day'] == date(2026, 9, 26)
+
+
+def test_compact_merges_into_existing_segment(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('quote', '2026-10-05', recipient='a', content='q1')
+    history.compact()
+    history.append('quote', '2026-10-01', recipient='b', content='q2')
+    history.compact()
+
+    assert _segment_files(history, 'quote') == ['2026-10.seg.gz']
+    records = history.scan('quote')
+    assert [(record['day'], record['content']) for record in records] == [
+        (date(2026, 10, 1), 'q2'), (date(2026, 10, 5), 'q1')]
+
+
+def test_append_compacts_at_threshold(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=3)
+    for day in range(1, 5):
+        history.append('holiday', date(2026, 10, day), holiday=f'h{day}')
+
+    assert _segment_files(history, 'holiday') == ['2026-10.seg.gz']
+    assert len(history.scan('holiday')) == 4
+
+
+def test_scan_combines_segments_and_active_log(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    for day in range(1, 6):
+        history.append('quote', date(2026, 10, day), recipient='a', content=f'a{day}')
+        history.append('quote', date(2026, 10, day), recipient='b', content=f'b{day}')
+    history.compact()
+    history.append('quote', '2026-10-06', recipient='a', content='a6')
+    history.append('quote', '2026-11-02', recipient='a', content='a7')
+
+    records = history.scan('quote', '2026-10-03', '2026-11-01', recipient='a')
+    assert [record['content'] for record in records] == ['a3', 'a4', 'a5', 'a6']
+    assert history.scan('quote', recipient='missing') == []
+    assert history.recent_quotes('b', days=2, today=date(2026, 10, 5)) == {'b3', 'b4', 'b5'}
+
+
+def test_scan_skips_months_outside_range(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('holiday', '2025-01-01', holiday='元旦')
+    history.append('holiday', '2026-10-01', holiday='国庆节')
+    history.compact()
+    # 损坏范围外的段文件，确保扫描不会打开它
+    with open(os.path.join(history.root, 'holiday', '2025-01.seg.gz'), 'wb') as f:
+        f.write(b'broken')
+
+    assert [record['holiday'] for record in history.scan('holiday', '2026-01-01')] == ['国庆节']
+
+
+def test_temperature_change_uses_last_write_of_the_day(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('weather', '2026-10-18', adcode='440300', dayweather='晴', daytemp=30, nighttemp=22)
+    history.append('weather', '2026-10-19', adcode='440300', dayweather='晴', daytemp=25, nighttemp=20)
+    history.compact()
+    # 同一天被之后的运行重新记录，且位于活动日志中
+    history.append('weather', '2026-10-19', adcode='440300', dayweather='小雨', daytemp=12, nighttemp=10)
+
+    assert history.temperature_change('440300', '2026-10-19') == -18
+    assert history.temperature_change('440300', '2026-10-20') is None
+    assert history.temperature_change('110000', '2026-10-19') is None
+
+
+def test_delivery_success_rate_by_day(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('delivery', '2026-10-01', recipient='self', title='t', ok=True, status=200)
+    history.append('delivery', '2026-10-01', recipient='self', title='t', ok=False, status=500)
+    history.append('delivery', '2026-10-02', recipient='self', title='t', ok=True, status=200)
+
+    assert history.delivery_success_rate('2026-10-01', '2026-10-02') == {
+        date(2026, 10, 1): 0.5, date(2026, 10, 2): 1.0}
+
+
+def test_append_logs_invalid_values_instead_of_raising(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('live', '2026-10-19', adcode='440300', weather='晴', temperature='N/A')
+    history.append('live', '2026-10-19', adcode='440300', weather='晴', temperature='25')
+
+    assert [record['temperature'] for record in history.scan('live')] == [25]
+
+
+def _corrupt_segment(history, table, month):
+    with open(os.path.join(history.root, table, f'{month}.seg.gz'), 'wb') as f:
+        f.write(b'broken')
+
+
+def test_scan_survives_corrupt_segment_in_range(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('quote', '2026-09-20', recipient='self', content='old')
+    history.append('quote', '2026-10-01', recipient='self', content='q1')
+    history.compact()
+    history.append('quote', '2026-10-05', recipient='self', content='q2')
+    _corrupt_segment(history, 'quote', '2026-10')
+
+    assert history.recent_quotes('self', days=90, today=date(2026, 10, 10)) == {'old', 'q2'}
+    assert os.path.exists(os.path.join(history.root, 'quote', '2026-10.seg.gz.corrupt'))
+    assert _segment_files(history, 'quote') == ['2026-09.seg.gz']
+
+
+def test_compact_moves_corrupt_segment_aside(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=2)
+    history.append('weather', '2026-10-18', adcode='440300', dayweather='晴', daytemp=30, nighttemp=22)
+    history.append('weather', '2026-10-19', adcode='440300', dayweather='晴', daytemp=25, nighttemp=20)
+    _corrupt_segment(history, 'weather', '2026-10')
+    history.append('weather', '2026-10-19', adcode='440300', dayweather='晴', daytemp=20, nighttemp=18)
+    history.append('weather', '2026-10-20', adcode='440300', dayweather='晴', daytemp=18, nighttemp=15)
+
+    # 损坏的段被移开后压实成功，活动日志不会无限增长
+    assert not os.path.exists(os.path.join(history.root, 'weather', 'active.jsonl'))
+    assert history.temperature_change('440300', '2026-10-20') == -2
+
+
+def test_scan_validates_filters(tmp_path):
+    history = RunHistory(str(tmp_path), compact_threshold=1000)
+    history.append('weather', '2026-10-01', adcode='440300', dayweather='晴', daytemp=30, nighttemp=22)
+    history.compact()
+    history.append('weather', '2026-10-02', adcode='440300', dayweather='晴', daytemp=28, nighttemp=21)
+
+    with pytest.raises(ValueError, match='recipient'):
+        history.scan('weather', recipient='self')
+    with pytest.raises(ValueError, match='daytemp'):
+        history.scan('weather', daytemp='hot')
+    # 过滤值按列类型转换，段文件和活动日志中的记录一致匹配
+    assert [record['daytemp'] for record in history.scan('weather', adcode=440300)] == [30, 28]
+    assert [record['day'].day for record in history.scan('weather', daytemp='28')] == [2]